@@ -1,12 +1,138 @@
+import contextlib
+import functools
+from collections import defaultdict
 from PySide2 import QtWidgets, QtCore
 from maya import cmds, mel
 import maya.OpenMayaUI as omui
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import numpy as np
 from shiboken2 import wrapInstance
 
+# Numba is optional; without it the influence count falls back to NumPy
+try:
+    import numba as nb
+except ImportError:
+    nb = None
+
+# translate, rotate, scale, rotate pivot, scale pivot of an untouched transform
+IDENTITY_TRANSFORM = np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0], dtype=np.float64)
+
+# Node types check_history accepts upstream of a mesh
+ALLOWED_HISTORY_TYPES = frozenset({
+    om.MFn.kSkinClusterFilter,
+    om.MFn.kTweak,
+    om.MFn.kGroupParts,
+    om.MFn.kGroupId,
+    om.MFn.kShadingEngine,
+    om.MFn.kBlendShape,  # Optionally allow blendShape
+})
+
+# Maya's main window lives for the whole session, so wrap it only once
+@functools.lru_cache(maxsize=1)
 def get_maya_main_window():
     main_window_ptr = omui.MQtUtil.mainWindow()
     return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
 
+def iter_dag_paths(fn_type, skip_intermediate=False):
+    """
+    Walks the DAG once in C++ and yields an MDagPath for every node of fn_type
+    (an om.MFn constant such as om.MFn.kTransform or om.MFn.kMesh).
+    With skip_intermediate=True, intermediate (e.g. Orig) shapes are left out.
+    """
+    it = om.MItDag(om.MItDag.kDepthFirst, fn_type)
+    while not it.isDone():
+        path = it.getPath()
+        if not (skip_intermediate and om.MFnDagNode(path).isIntermediateObject):
+            yield path
+        it.next()
+
+def get_parent_path(dag_path):
+    """Returns the full path name of the transform above a shape's MDagPath."""
+    parent_path = om.MDagPath(dag_path)
+    parent_path.pop()
+    return parent_path.fullPathName()
+
+def find_skin_cluster(mesh_path):
+    """
+    Returns an MFnSkinCluster for the nearest skinCluster upstream of a mesh,
+    or None if the mesh isn't skinned.
+    """
+    it = om.MItDependencyGraph(mesh_path.node(), om.MFn.kSkinClusterFilter,
+                               om.MItDependencyGraph.kUpstream,
+                               om.MItDependencyGraph.kBreadthFirst)
+    if it.isDone():
+        return None
+    return oma.MFnSkinCluster(it.currentNode())
+
+def get_skin_weights(fn_skin, mesh_path):
+    """
+    Fetches every skin weight of a mesh in one API call.
+
+    Returns a (num_vertices, num_influences) NumPy array, one row per vertex.
+    Raises RuntimeError if the weights can't be read through the API.
+    """
+    # A complete vertex component covers the whole mesh without listing indices
+    fn_comp = om.MFnSingleIndexedComponent()
+    components = fn_comp.create(om.MFn.kMeshVertComponent)
+    fn_comp.setCompleteData(om.MFnMesh(mesh_path).numVertices)
+
+    weights, influence_count = fn_skin.getWeights(mesh_path, components)
+    return np.array(weights, dtype=np.float64).reshape(-1, influence_count)
+
+if nb is not None:
+    # The explicit signature compiles at import, and cache=True keeps the
+    # compiled kernel on disk so later sessions skip the compile
+    @nb.njit(nb.int64[:](nb.float64[:, :], nb.int64), cache=True, parallel=True)
+    def _count_over_influences(weights, max_influences):
+        n = weights.shape[0]
+        out = np.empty(n, np.int64)
+        for i in nb.prange(n):
+            count = 0
+            for j in range(weights.shape[1]):
+                if weights[i, j] != 0.0:
+                    count += 1
+            out[i] = 1 if count > max_influences else 0
+        return out
+else:
+    _count_over_influences = None
+
+def find_over_influenced(weights, max_influences):
+    """
+    Returns the indices of the vertices (rows of a get_skin_weights array)
+    with more than max_influences non-zero weights.
+    """
+    if _count_over_influences is not None:
+        return np.flatnonzero(_count_over_influences(weights, max_influences))
+    return np.flatnonzero((weights != 0).sum(axis=1) > max_influences)
+
+# Nesting depth of batched_scene_edit, so only the outermost block
+# suspends and resumes the viewport
+_scene_edit_depth = 0
+
+@contextlib.contextmanager
+def batched_scene_edit():
+    """
+    Groups all the cmds calls made inside the block into one undo entry,
+    with viewport refresh and Script Editor results suppressed until the
+    outermost block exits. The viewport is redrawn once at the end.
+    """
+    global _scene_edit_depth
+    if _scene_edit_depth == 0:
+        suppress_results = cmds.scriptEditorInfo(q=True, suppressResults=True)
+        cmds.undoInfo(openChunk=True)
+        cmds.refresh(suspend=True)
+        cmds.scriptEditorInfo(e=True, suppressResults=True)
+    _scene_edit_depth += 1
+    try:
+        yield
+    finally:
+        _scene_edit_depth -= 1
+        if _scene_edit_depth == 0:
+            cmds.scriptEditorInfo(e=True, suppressResults=suppress_results)
+            cmds.refresh(suspend=False)
+            cmds.undoInfo(closeChunk=True)
+
 # ============================================================================
 # CUSTOM BUTTON SUBCLASS
 # ============================================================================
@@ -18,9 +144,11 @@ def get_maya_main_window():
 class UmbraButton(QtWidgets.QPushButton):
     """
     A custom button that automatically:
-    1. Styles itself with blue background
+    1. Marks itself so the dialog's stylesheet gives it a blue background
     2. Adds itself to a grid layout at the specified position
     3. Connects its click signal to the provided function
+    4. Runs that function as one undo step with viewport refresh suspended
+    5. Selects whatever nodes the function returns (e.g. failed checks)
     
     This eliminates the need to repeat these steps for every button.
     """
@@ -40,167 +168,171 @@ class UmbraButton(QtWidgets.QPushButton):
         # This gives us all the standard button functionality
         super(UmbraButton, self).__init__(text, parent=parent)
         
-        # Define the blue styling for all our buttons
-        blue_style = "background-color: #4d80e6; color: white; font-weight: bold; border: 1px solid #3366cc;"
-        
         # Store the function that should be called when clicked
         # We store it as an attribute so we can access it later
         self.click_function = click_fn
         
-        # Apply the blue style to THIS button (self refers to this button instance)
-        self.setStyleSheet(blue_style)
+        # Tag THIS button (self refers to this button instance) so the
+        # QPushButton[umbra="true"] rule in the dialog's stylesheet styles it.
+        # Qt then computes the blue style once instead of once per button.
+        self.setProperty("umbra", True)
         
         # Add this button to the grid layout at the specified position
         # columnSpan parameter makes the button stretch across multiple columns
         layout.addWidget(self, row, col, 1, colspan)
         
-        # Connect the button's clicked signal to our function
+        # Connect the button's clicked signal to our slot
         # When the button is clicked, it will automatically call click_fn
-        self.clicked.connect(self.click_function)
+        self.clicked.connect(self.on_clicked)
+
+    @QtCore.Slot()
+    def on_clicked(self):
+        # Declared as a Slot so PySide doesn't register it at connect time.
+        # The whole click is one undo step and the viewport only redraws
+        # once, after all the work is done. Check functions return the
+        # nodes that failed; they are selected as part of the same step.
+        with batched_scene_edit():
+            result = self.click_function()
+            if result:
+                cmds.select(result, r=True)
 
 # ============================================================================
 # MAIN DIALOG CLASS
 # ============================================================================
 
 class Umbra(QtWidgets.QDialog):
-    def __init__(self, parent=get_maya_main_window()):
+    # ========================================================================
+    # BUTTON TABLES
+    # ========================================================================
+    # Each entry is (button text, method name, row, col).
+    # init_ui loops over these tables to create the buttons, and the
+    # "Run All" functions loop over them to call each method, so no
+    # button references need to be kept around.
+    # ========================================================================
+    _CLEANUP_SPEC = (
+        ("Delete Unwanted Nodes", "delete_unwanted_nodes", 0, 0),
+        ("Delete Empty Groups", "delete_empty_groups", 0, 1),
+        ("Center Pivot", "center_pivot", 1, 0),
+        ("Bounding Box + Frame", "set_viewport_bounding_box", 1, 1),
+        ("Delete Unused Nodes", "delete_unused_nodes", 2, 0),
+        ("Group Visible as 'GEO'", "group_geo", 2, 1),
+    )
+    _CHECK_SPEC = (
+        ("Check Color Sets", "check_colorsets", 0, 0),
+        ("Check UV Sets", "check_uvsets", 0, 1),
+        ("Check Max Influences", "check_max_influences", 1, 0),
+        ("Check Unnecessary History", "check_history", 1, 1),
+        ("Check Transformed Mesh (and Pivot)", "check_transform", 2, 0),
+        ("Check Rotated Joints", "check_rot_joints", 2, 1),
+        ("Check Scaled Joints", "check_scale_joints", 3, 0),
+        ("Check Same Name GEO", "check_same_name", 3, 1),
+    )
+
+    def __init__(self, parent=None):
+        # Looked up here rather than as a default argument, which would run
+        # once at import time, possibly before the main window exists
+        if parent is None:
+            parent = get_maya_main_window()
         super(Umbra, self).__init__(parent)
         self.setWindowTitle("Umbra")
         self.setMinimumSize(450, 800)
         self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
-        # Set dark color scheme for the dialog
-        self.setStyleSheet("background-color: #1e1e1e; color: white;")
+        # Set dark color scheme for the dialog, plus the blue styling
+        # shared by every UmbraButton
+        self.setStyleSheet(
+            "* { background-color: #1e1e1e; color: white; }"
+            'QPushButton[umbra="true"] { background-color: #4d80e6; color: white; '
+            "font-weight: bold; border: 1px solid #3366cc; }"
+        )
         
-        # ====================================================================
-        # BUTTON LISTS
-        # ====================================================================
-        # These lists will store references to our buttons.
-        # This allows us to loop through all buttons in the "Run All" functions
-        # instead of hard-coding each function call.
-        # ====================================================================
-        self._cleanup_buttons = []  # Stores Model Scene Cleaner buttons
-        self._check_buttons = []    # Stores Character Model Check buttons
+        # While _batched is True, log() collects messages in _log_buffer
+        # and the "Run All" functions write them out in one go
+        self._log_buffer = []
+        self._batched = False
         
-        self.init_ui()
+        # The widgets are built on first show (see showEvent), so creating
+        # the dialog itself stays cheap
+        self._ui_built = False
+
+    def showEvent(self, event):
+        if not self._ui_built:
+            # Marked first so a build that raises isn't retried on top of
+            # the half-built widgets (and a second layout on the dialog)
+            self._ui_built = True
+            self.init_ui()
+        super(Umbra, self).showEvent(event)
 
     def init_ui(self):
-        layout = QtWidgets.QVBoxLayout(self)
+        # Hold off painting until every widget is in place, so Qt lays out
+        # the dialog in one pass instead of after each button
+        self.setUpdatesEnabled(False)
+        try:
+            layout = QtWidgets.QVBoxLayout(self)
 
-        # --- Model Scene Cleaner Section ---
-        cleaner_label = QtWidgets.QLabel("<b>Model Scene Cleaner</b>")
-        layout.addWidget(cleaner_label)
+            # --- Model Scene Cleaner Section ---
+            cleaner_label = QtWidgets.QLabel("<b>Model Scene Cleaner</b>")
+            layout.addWidget(cleaner_label)
 
-        # ====================================================================
-        # MODEL SCENE CLEANER BUTTONS (Using our custom UmbraButton class)
-        # ====================================================================
-        # Notice how each button creation is now just ONE line instead of THREE:
-        # - No need to manually add to layout
-        # - No need to manually set style
-        # - No need to manually connect signal
-        # The UmbraButton class handles all of that automatically!
-        # ====================================================================
+            # ====================================================================
+            # MODEL SCENE CLEANER BUTTONS (Using our custom UmbraButton class)
+            # ====================================================================
+            # Notice how each button creation is now just ONE line instead of THREE:
+            # - No need to manually add to layout
+            # - No need to manually set style
+            # - No need to manually connect signal
+            # The UmbraButton class handles all of that automatically!
+            # ====================================================================
         
-        button_layout = QtWidgets.QGridLayout()
+            button_layout = QtWidgets.QGridLayout()
         
-        # Each button is created with: (text, layout, row, col, function_to_call)
-        # append() adds the button to our list so we can loop through it later
-        self._cleanup_buttons.append(
-            UmbraButton("Delete Unwanted Nodes", button_layout, 0, 0, 
-                         self.delete_unwanted_nodes, parent=self)
-        )
-        self._cleanup_buttons.append(
-            UmbraButton("Delete Empty Groups", button_layout, 0, 1, 
-                         self.delete_empty_groups, parent=self)
-        )
-        self._cleanup_buttons.append(
-            UmbraButton("Center Pivot", button_layout, 1, 0, 
-                         self.center_pivot, parent=self)
-        )
-        self._cleanup_buttons.append(
-            UmbraButton("Bounding Box + Frame", button_layout, 1, 1, 
-                         self.set_viewport_bounding_box, parent=self)
-        )
-        self._cleanup_buttons.append(
-            UmbraButton("Delete Unused Nodes", button_layout, 2, 0, 
-                         self.delete_unused_nodes, parent=self)
-        )
-        self._cleanup_buttons.append(
-            UmbraButton("Group Visible as 'GEO'", button_layout, 2, 1, 
-                         self.group_geo, parent=self)
-        )
+            # Each button is created with: (text, layout, row, col, function_to_call)
+            for text, attr, row, col in self._CLEANUP_SPEC:
+                UmbraButton(text, button_layout, row, col, getattr(self, attr), parent=self)
         
-        layout.addLayout(button_layout)
+            layout.addLayout(button_layout)
         
-        # The "Run All" button spans 2 columns (colspan=2)
-        # We DON'T add it to the list to avoid infinite recursion!
-        # (If we did, clicking "Run All" would call itself forever)
-        UmbraButton("Run All Cleanup", button_layout, 3, 0, 
-                     self.run_all, colspan=2, parent=self)
+            # The "Run All" button spans 2 columns (colspan=2)
+            # It is NOT in _CLEANUP_SPEC to avoid infinite recursion!
+            # (If we did, clicking "Run All" would call itself forever)
+            UmbraButton("Run All Cleanup", button_layout, 3, 0, 
+                         self.run_all, colspan=2, parent=self)
 
-        # ====================================================================
-        # CHARACTER MODEL CHECKS SECTION
-        # ====================================================================
-        # Same pattern as above - each button is one line!
-        # Compare this to the old code that required:
-        # - 1 line to create
-        # - 1 line to add to layout  
-        # - 1 line to set style
-        # - 1 line to connect signal
-        # That's 4 lines reduced to 1 line per button!
-        # ====================================================================
+            # ====================================================================
+            # CHARACTER MODEL CHECKS SECTION
+            # ====================================================================
+            # Same pattern as above - each button is one line!
+            # Compare this to the old code that required:
+            # - 1 line to create
+            # - 1 line to add to layout  
+            # - 1 line to set style
+            # - 1 line to connect signal
+            # That's 4 lines reduced to 1 line per button!
+            # ====================================================================
         
-        char_label = QtWidgets.QLabel("<b>Character Model Checks</b>")
-        layout.addWidget(char_label)
+            char_label = QtWidgets.QLabel("<b>Character Model Checks</b>")
+            layout.addWidget(char_label)
 
-        char_button_layout = QtWidgets.QGridLayout()
+            char_button_layout = QtWidgets.QGridLayout()
         
-        # Create all check buttons and add them to the _check_buttons list
-        self._check_buttons.append(
-            UmbraButton("Check Color Sets", char_button_layout, 0, 0, 
-                         self.check_colorsets, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check UV Sets", char_button_layout, 0, 1, 
-                         self.check_uvsets, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Max Influences", char_button_layout, 1, 0, 
-                         self.check_max_influences, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Unnecessary History", char_button_layout, 1, 1, 
-                         self.check_history, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Transformed Mesh (and Pivot)", char_button_layout, 2, 0, 
-                         self.check_transform, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Rotated Joints", char_button_layout, 2, 1, 
-                         self.check_rot_joints, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Scaled Joints", char_button_layout, 3, 0, 
-                         self.check_scale_joints, parent=self)
-        )
-        self._check_buttons.append(
-            UmbraButton("Check Same Name GEO", char_button_layout, 3, 1, 
-                         self.check_same_name, parent=self)
-        )
+            # Create all check buttons from the _CHECK_SPEC table
+            for text, attr, row, col in self._CHECK_SPEC:
+                UmbraButton(text, char_button_layout, row, col, getattr(self, attr), parent=self)
         
-        layout.addLayout(char_button_layout)
+            layout.addLayout(char_button_layout)
         
-        # "Run All" button spans 2 columns and is NOT added to the list
-        UmbraButton("Run All Character Model Checks", char_button_layout, 4, 0, 
-                     self.run_all_char_checks, colspan=2, parent=self)
+            # "Run All" button spans 2 columns and is NOT in _CHECK_SPEC
+            UmbraButton("Run All Character Model Checks", char_button_layout, 4, 0, 
+                         self.run_all_char_checks, colspan=2, parent=self)
 
-        # ====================================================================
-        # LOG OUTPUT
-        # ====================================================================
-        self.log_output = QtWidgets.QTextEdit()
-        self.log_output.setReadOnly(True)
-        self.log_output.setStyleSheet("background-color: #2b2b2b; color: white; border: 1px solid #555555;")
-        layout.addWidget(self.log_output)
+            # ====================================================================
+            # LOG OUTPUT
+            # ====================================================================
+            self.log_output = QtWidgets.QTextEdit()
+            self.log_output.setReadOnly(True)
+            self.log_output.setStyleSheet("background-color: #2b2b2b; color: white; border: 1px solid #555555;")
+            layout.addWidget(self.log_output)
+        finally:
+            self.setUpdatesEnabled(True)
         
         # ====================================================================
         # NOTICE: No more signal connections or styling needed!
@@ -216,13 +348,39 @@ class Umbra(QtWidgets.QDialog):
         #   - All handled in UmbraButton.__init__()
         # ====================================================================
 
+    def closeEvent(self, event):
+        global _current_umbra
+        if _current_umbra is self:
+            _current_umbra = None
+        super(Umbra, self).closeEvent(event)
+
     def log(self, message, color=None):
         if color:
-            self.log_output.append(f'<span style="color: {color};">{message}</span>')
+            html = f'<span style="color: {color};">{message}</span>'
         else:
-            self.log_output.append(message)
+            html = message
+        if self._batched:
+            self._log_buffer.append(html)
+        else:
+            self.log_output.append(html)
         print(message)
 
+    def flush_log(self):
+        """
+        Writes all buffered messages to the log with a single append,
+        so the text box only lays itself out once.
+        """
+        self._batched = False
+        if not self._log_buffer:
+            return
+        self.log_output.setUpdatesEnabled(False)
+        try:
+            self.log_output.append("<br>".join(self._log_buffer))
+        finally:
+            self.log_output.setUpdatesEnabled(True)
+        self._log_buffer = []
+
+    @QtCore.Slot()
     def delete_unwanted_nodes(self):
         nodes = cmds.ls(type=["unknown", "unknownDag", "unknownTransform"])
         if nodes:
@@ -231,41 +389,60 @@ class Umbra(QtWidgets.QDialog):
         else:
             self.log("No unwanted nodes found.", color='lime')
 
+    @QtCore.Slot()
     def delete_empty_groups(self):
-        groups = [grp for grp in cmds.ls(type="transform") if not cmds.listRelatives(grp)]
+        groups = [path.fullPathName() for path in iter_dag_paths(om.MFn.kTransform)
+                  if om.MFnDagNode(path).childCount() == 0]
         if groups:
             cmds.delete(groups)
             self.log(f"Deleted {len(groups)} empty groups.", color='lime')
         else:
             self.log("No empty groups found.", color='lime')
 
+    @QtCore.Slot()
     def center_pivot(self):
-        all_objects = cmds.ls(dag=True, long=True)
-        for obj in all_objects:
+        # Only transforms carry pivots, so shapes are left out up front
+        all_objects = cmds.ls(dag=True, long=True, transforms=True)
+        if not all_objects:
+            self.log("No objects to center pivot on.", color='lime')
+            return
+        with batched_scene_edit():
             try:
-                cmds.select(obj, r=True)
-                mel.eval("CenterPivot;")
-            except Exception:
-                pass
+                cmds.xform(all_objects, centerPivots=True)
+            except RuntimeError:
+                # One locked node fails the whole batch, so retry node by node
+                for obj in all_objects:
+                    try:
+                        cmds.xform(obj, centerPivots=True)
+                    except RuntimeError:
+                        pass
         self.log("Centered pivot on all objects.", color='lime')
 
+    @QtCore.Slot()
     def set_viewport_bounding_box(self):
         try:
-            panels = cmds.getPanel(type="modelPanel")
-            for panel in panels:
-                cmds.modelEditor(panel, edit=True, displayAppearance="boundingBox")
-            mel.eval("FrameAll;")
+            panels = cmds.getPanel(type="modelPanel") or []
+            # Switch every panel before the viewport redraws once
+            with batched_scene_edit():
+                for panel in panels:
+                    cmds.modelEditor(panel, edit=True, displayAppearance="boundingBox")
+            cmds.viewFit(all=True)
             self.log("Set all viewports to Bounding Box shading mode and framed viewport.", color='lime')
         except Exception as e:
             self.log(f"Viewport update failed: {e}", color='red')
 
+    @QtCore.Slot()
     def delete_unused_nodes(self):
         try:
-            mel.eval('hyperShadePanelMenuCommand("hyperShadePanel1", "deleteUnusedNodes");')
+            # MLdeleteUnused is what the Hypershade menu item runs; calling it
+            # directly skips the panel refresh (cmds.hyperShade has no
+            # equivalent flag)
+            mel.eval("MLdeleteUnused;")
             self.log("Deleted unused shader nodes.", color='lime')
         except Exception as e:
             self.log(f"Failed to delete unused nodes: {e}", color='red')
 
+    @QtCore.Slot()
     def group_geo(self):
         objs = cmds.ls(visible=True, long=True)
         if objs:
@@ -278,227 +455,235 @@ class Umbra(QtWidgets.QDialog):
         else:
             self.log("No visible objects to group.", color='lime')
 
+    @QtCore.Slot()
     def run_all(self):
         """
-        Runs all cleanup functions by looping through the _cleanup_buttons list.
+        Runs all cleanup functions by looping through the _CLEANUP_SPEC table.
         
         OLD WAY: Hard-code each function call
             self.delete_unwanted_nodes()
             self.delete_empty_groups()
             ... etc ...
         
-        NEW WAY: Loop through buttons and call their stored functions
-            for button in self._cleanup_buttons:
-                button.click_function()
+        NEW WAY: Loop through the table and call each named method
+            for _, attr, *_ in self._CLEANUP_SPEC:
+                getattr(self, attr)()
         
         BENEFITS:
-        - Adding a new button automatically adds it to "Run All"
+        - Adding a new entry to the table automatically adds it to "Run All"
         - No need to update this function when adding/removing buttons
         - Less code, fewer places to make mistakes
         """
-        self.log("Running all cleanup actions...")
-        
-        # Loop through each cleanup button and call its associated function
-        for button in self._cleanup_buttons:
-            # Remember: we stored the function in the button's click_function attribute
-            button.click_function()
-        
-        self.log("Umbra cleanup finished.")
+        self._batched = True
+        try:
+            self.log("Running all cleanup actions...")
+            
+            # Loop through each cleanup entry and call its method by name.
+            # The "Run All" button already batches the whole run as one undo step.
+            for _, attr, *_ in self._CLEANUP_SPEC:
+                getattr(self, attr)()
+            
+            self.log("Umbra cleanup finished.")
+        finally:
+            self.flush_log()
 
     # --- Character Model Checks Functions ---
+    @QtCore.Slot()
     def check_colorsets(self):
         correct_colorset_count = 1  # Default, can be made user-configurable
-        meshes = cmds.ls(type='mesh', long=True)
         error_meshes = []
-        for mesh in meshes:
-            if not cmds.getAttr(mesh + '.intermediateObject'):
-                color_sets = cmds.polyColorSet(mesh, q=True, acs=True)
-                if color_sets is not None:
-                    if len(color_sets) != correct_colorset_count:
-                        error_meshes.append(mesh)
-                elif correct_colorset_count != 0:
-                    error_meshes.append(mesh)
+        for mesh_path in iter_dag_paths(om.MFn.kMesh, skip_intermediate=True):
+            if om.MFnMesh(mesh_path).numColorSets != correct_colorset_count:
+                error_meshes.append(mesh_path.fullPathName())
         if error_meshes:
-            cmds.select(error_meshes, r=True)
             self.log(f"Meshes with incorrect color set count: {error_meshes}", color='red')
         else:
             self.log("All meshes have the correct number of color sets.", color='lime')
+        return error_meshes
 
+    @QtCore.Slot()
     def check_uvsets(self):
         correct_uvset_count = 1  # Default, can be made user-configurable
-        meshes = cmds.ls(type='mesh', long=True)
         error_meshes = []
-        for mesh in meshes:
-            if not cmds.getAttr(mesh + '.intermediateObject'):
-                uv_sets = cmds.polyUVSet(mesh, q=True, auv=True)
-                if uv_sets is not None:
-                    if len(uv_sets) != correct_uvset_count:
-                        error_meshes.append(mesh)
-                elif correct_uvset_count != 0:
-                    error_meshes.append(mesh)
+        for mesh_path in iter_dag_paths(om.MFn.kMesh, skip_intermediate=True):
+            if om.MFnMesh(mesh_path).numUVSets != correct_uvset_count:
+                error_meshes.append(mesh_path.fullPathName())
         if error_meshes:
-            cmds.select(error_meshes, r=True)
             self.log(f"Meshes with incorrect UV set count: {error_meshes}", color='red')
         else:
             self.log("All meshes have the correct number of UV sets.", color='lime')
+        return error_meshes
 
+    @QtCore.Slot()
     def check_max_influences(self):
         max_influences = 4  # Default, can be made user-configurable
-        meshes = cmds.ls(type='mesh', long=True)
         error_verts = []
-        for mesh in meshes:
-            transform = cmds.listRelatives(mesh, parent=True, fullPath=True)
-            if not transform:
+        for mesh_path in iter_dag_paths(om.MFn.kMesh, skip_intermediate=True):
+            fn_skin = find_skin_cluster(mesh_path)
+            if fn_skin is None:
                 continue
-            transform = transform[0]
-            vtx_list = cmds.ls(f'{transform}.vtx[*]', fl=True)
-            sc = None
-            for history in cmds.listHistory(transform):
-                if cmds.objectType(history) == 'skinCluster':
-                    sc = history
-                    break
-            if sc is not None:
-                for vtx in vtx_list:
+            transform = get_parent_path(mesh_path)
+            try:
+                weights = get_skin_weights(fn_skin, mesh_path)
+            except RuntimeError:
+                # Fall back to querying one vertex at a time
+                sc = fn_skin.name()
+                for vtx in cmds.ls(f'{transform}.vtx[*]', fl=True):
                     skin_values = cmds.skinPercent(sc, vtx, q=True, v=True)
                     non_zero_values = [v for v in skin_values if v != 0]
                     if len(non_zero_values) > max_influences:
                         error_verts.append(vtx)
+                continue
+            error_verts.extend(f'{transform}.vtx[{i}]'
+                               for i in find_over_influenced(weights, max_influences))
         if error_verts:
-            cmds.select(error_verts, r=True)
             self.log(f"Vertices with more than {max_influences} influences: {error_verts}", color='red')
         else:
             self.log("No vertices exceed the max influences.", color='lime')
+        return error_verts
 
+    @QtCore.Slot()
     def check_history(self):
-        meshes = cmds.ls(type='mesh', long=True)
         error_meshes = []
-        for mesh in meshes:
-            transform = cmds.listRelatives(mesh, parent=True, fullPath=True)
-            if not transform:
-                continue
-            transform = transform[0]
-            his_list = cmds.listHistory(transform, pdo=True)
-            bad_his = []
-            if his_list is not None:
-                for his in his_list:
-                    node_type = cmds.nodeType(his)
-                    if node_type in ['skinCluster', 'tweak', 'groupParts', 'groupId', 'shadingEngine']:
-                        continue
-                    elif node_type == 'blendShape':
-                        continue  # Optionally allow blendShape
-                    else:
-                        bad_his.append(his)
-                if len(bad_his) >= 1:
-                    error_meshes.append(transform)
+        for mesh_path in iter_dag_paths(om.MFn.kMesh, skip_intermediate=True):
+            mesh = mesh_path.node()
+            # Walk plugs from inMesh so only connections that feed the geometry
+            # are followed, like listHistory; a node-level walk would also pick
+            # up message connections such as bindPose -> skinCluster
+            in_mesh = om.MFnDependencyNode(mesh).findPlug("inMesh", False)
+            it = om.MItDependencyGraph(in_mesh, om.MFn.kInvalid,
+                                       om.MItDependencyGraph.kUpstream,
+                                       om.MItDependencyGraph.kDepthFirst,
+                                       om.MItDependencyGraph.kPlugLevel)
+            while not it.isDone():
+                node = it.currentNode()
+                if node == mesh:
+                    pass
+                elif node.hasFn(om.MFn.kDagNode):
+                    # Like listHistory(pdo=True): don't walk past other DAG objects
+                    it.prune()
+                elif node.apiType() not in ALLOWED_HISTORY_TYPES:
+                    error_meshes.append(get_parent_path(mesh_path))
+                    break
+                it.next()
         if error_meshes:
-            cmds.select(error_meshes, r=True)
             self.log(f"Meshes with unnecessary history: {error_meshes}", color='red')
         else:
             self.log("No unnecessary history found.", color='lime')
+        return error_meshes
 
+    @QtCore.Slot()
     def check_transform(self):
         decimal_places = 3  # Default, can be made user-configurable
-        meshes = cmds.ls(type='mesh', long=True)
-        error_meshes = []
-        for mesh in meshes:
-            transform = cmds.listRelatives(mesh, parent=True, fullPath=True)
-            if not transform:
-                continue
-            transform = transform[0]
-            attrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz',
-                     'rotatePivotX', 'rotatePivotY', 'rotatePivotZ',
-                     'scalePivotX', 'scalePivotY', 'scalePivotZ']
-            values = [cmds.getAttr(f'{transform}.{attr}') for attr in attrs]
-            # Check translation/rotation != 0, scale != 1, pivots != 0
-            if (round(values[0], decimal_places) != 0 or
-                round(values[1], decimal_places) != 0 or
-                round(values[2], decimal_places) != 0 or
-                round(values[3], decimal_places) != 0 or
-                round(values[4], decimal_places) != 0 or
-                round(values[5], decimal_places) != 0 or
-                round(values[6], decimal_places) != 1 or
-                round(values[7], decimal_places) != 1 or
-                round(values[8], decimal_places) != 1 or
-                round(values[9], decimal_places) != 0 or
-                round(values[10], decimal_places) != 0 or
-                round(values[11], decimal_places) != 0 or
-                round(values[12], decimal_places) != 0 or
-                round(values[13], decimal_places) != 0 or
-                round(values[14], decimal_places) != 0):
-                error_meshes.append(transform)
+        transforms = [get_parent_path(mesh_path)
+                      for mesh_path in iter_dag_paths(om.MFn.kMesh, skip_intermediate=True)]
+        # One row per transform: translate, rotate, scale, rotate pivot, scale pivot
+        values = np.empty((len(transforms), 15), dtype=np.float64)
+        for row, transform in enumerate(transforms):
+            values[row] = (cmds.xform(transform, q=True, t=True, os=True) +
+                           cmds.xform(transform, q=True, ro=True, os=True) +
+                           cmds.xform(transform, q=True, s=True, r=True) +
+                           cmds.xform(transform, q=True, rp=True, os=True) +
+                           cmds.xform(transform, q=True, sp=True, os=True))
+        # Check translation/rotation != 0, scale != 1, pivots != 0 for all rows at once
+        errors = np.any(np.round(values - IDENTITY_TRANSFORM, decimal_places) != 0, axis=1)
+        error_meshes = [t for t, e in zip(transforms, errors) if e]
         if error_meshes:
-            cmds.select(error_meshes, r=True)
             self.log(f"Meshes with non-identity transform or pivot: {error_meshes}", color='red')
         else:
             self.log("All meshes have identity transform and pivot.", color='lime')
+        return error_meshes
 
+    @QtCore.Slot()
     def check_rot_joints(self):
         decimal_places = 3  # Default, can be made user-configurable
         joints = cmds.ls(type='joint', long=True)
         error_joints = []
         for joint in joints:
-            rx = cmds.getAttr(f'{joint}.rx')
-            ry = cmds.getAttr(f'{joint}.ry')
-            rz = cmds.getAttr(f'{joint}.rz')
+            rx, ry, rz = cmds.xform(joint, q=True, ro=True, os=True)
             if (round(rx, decimal_places) != 0 or
                 round(ry, decimal_places) != 0 or
                 round(rz, decimal_places) != 0):
                 error_joints.append(joint)
         if error_joints:
-            cmds.select(error_joints, r=True)
             self.log(f"Joints with non-zero rotation: {error_joints}", color='red')
         else:
             self.log("All joints have zero rotation.", color='lime')
+        return error_joints
 
+    @QtCore.Slot()
     def check_scale_joints(self):
         decimal_places = 3  # Default, can be made user-configurable
         joints = cmds.ls(type='joint', long=True)
         error_joints = []
         for joint in joints:
-            sx = cmds.getAttr(f'{joint}.sx')
-            sy = cmds.getAttr(f'{joint}.sy')
-            sz = cmds.getAttr(f'{joint}.sz')
+            sx, sy, sz = cmds.xform(joint, q=True, s=True, r=True)
             if (round(sx, decimal_places) != 1 or
                 round(sy, decimal_places) != 1 or
                 round(sz, decimal_places) != 1):
                 error_joints.append(joint)
         if error_joints:
-            cmds.select(error_joints, r=True)
             self.log(f"Joints with non-identity scale: {error_joints}", color='red')
         else:
             self.log("All joints have identity scale.", color='lime')
+        return error_joints
 
+    @QtCore.Slot()
     def check_same_name(self):
-        transforms = cmds.ls(type='transform')
-        error_nodes = []
-        for node in transforms:
-            if '|' in node:
-                error_nodes.append(node)
+        # Group full paths by their leaf name; any name used twice is a clash
+        paths_by_name = defaultdict(list)
+        for path in cmds.ls(type='transform', long=True):
+            paths_by_name[path.rsplit('|', 1)[-1]].append(path)
+        error_nodes = [path for paths in paths_by_name.values() if len(paths) > 1
+                       for path in paths]
         if error_nodes:
-            cmds.select(error_nodes, r=True)
             self.log(f"Nodes with duplicate names: {error_nodes}", color='red')
         else:
             self.log("No duplicate node names found.", color='lime')
+        return error_nodes
 
+    @QtCore.Slot()
     def run_all_char_checks(self):
         """
-        Runs all character model checks by looping through the _check_buttons list.
+        Runs all character model checks by looping through the _CHECK_SPEC table.
         
-        Same principle as run_all() above - we loop through the buttons
+        Same principle as run_all() above - we loop through the table
         instead of hard-coding each function call.
+
+        Each check returns its failing nodes; they are collected and
+        selected once at the end instead of after every check.
         """
-        # Loop through each check button and call its associated function
-        for button in self._check_buttons:
-            button.click_function()
-        
-        self.log("All character model checks complete.")
+        all_errors = []
+        self._batched = True
+        try:
+            # Loop through each check entry and call its method by name
+            for _, attr, *_ in self._CHECK_SPEC:
+                all_errors.extend(getattr(self, attr)() or [])
+            
+            self.log("All character model checks complete.")
+        finally:
+            self.flush_log()
+        if all_errors:
+            cmds.select(all_errors, r=True)
+
+# The open Umbra dialog, so show_umbra can close it without scanning
+# every widget in the application
+_current_umbra = None
 
 def show_umbra():
-    for widget in QtWidgets.QApplication.allWidgets():
-        if isinstance(widget, Umbra):
-            widget.close()
-    win = Umbra()
-    win.show()
+    global _current_umbra
+    # Take our own reference first: close() runs closeEvent, which clears
+    # the global before deleteLater() could be called on it
+    old_umbra, _current_umbra = _current_umbra, None
+    if old_umbra is not None:
+        try:
+            old_umbra.close()
+            old_umbra.deleteLater()
+        except RuntimeError:
+            # The C++ side of the dialog was already deleted
+            pass
+    _current_umbra = Umbra()
+    _current_umbra.show()
 
 # Run the tool
 show_umbra()
\ No newline at end of file